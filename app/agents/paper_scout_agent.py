@@ -6,6 +6,7 @@ Specialized agent for finding and analyzing research papers
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
+import re
 
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage, AIMessage
@@ -18,6 +19,9 @@ from app.services.pubmed_service import pubmed_service, PubMedPaper
 from app.services.translation_service import translation_service
 from app.models.schemas import TaskStatus
 
+# Fallback keyword tokenizer (words of 3+ characters)
+_FALLBACK_KEYWORD_TOKEN = re.compile(r'\b\w{3,}\b')
+
 class PaperScoutAgent(BaseAgent):
     """Agent specialized in finding and analyzing research papers"""
     
@@ -423,8 +427,7 @@ Focus on:
             
         except Exception:
             # Fallback to simple keyword extraction
-            import re
-            words = re.findall(r'\b\w{3,}\b', text.lower())
+            words = _FALLBACK_KEYWORD_TOKEN.findall(text.lower())
             return list(set(words))[:10]
     
     def _calculate_text_similarity(self, query_keywords: List[str], text: str) -> float:
@@ -5,6 +5,7 @@ Coordinates multiple specialized agents to create comprehensive literature revie
 
 from typing import Dict, List, Any, Optional, TypedDict, Annotated
 from datetime import datetime
+import asyncio
 import json
 
 from langgraph.graph import StateGraph, END
@@ -421,13 +422,14 @@ Provide specific section titles, main points, and the logical flow.
             analysis = state["analysis_results"]
             
             # Generate each section
-            sections = {}
             section_names = outline.get("sections", ["Introduction", "Literature Review", "Discussion", "Conclusion"])
             
-            for i, section_name in enumerate(section_names):
-                # Prepare paper citations for this section
-                paper_citations = self._prepare_paper_citations_for_content(state['papers'])
-                
+            # Prepare paper citations once; every section uses the same list
+            paper_citations = self._prepare_paper_citations_for_content(state['papers'])
+            completed_sections = 0
+            
+            async def write_section(section_name: str) -> str:
+                nonlocal completed_sections
                 section_prompt = f"""
 As the Content Writer, write the "{section_name}" section for a {state['review_type']} literature review on "{state['topic']}".
 
@@ -455,11 +457,16 @@ Write a comprehensive {section_name.lower()} section (aim for {self._get_section
                 
                 messages = [HumanMessage(content=section_prompt)]
                 section_content = await self.invoke_llm(messages)
-                sections[section_name] = section_content
                 
                 # Update progress
-                section_progress = 80.0 + (i + 1) / len(section_names) * 10
+                completed_sections += 1
+                section_progress = 80.0 + completed_sections / len(section_names) * 10
                 await self.update_task_progress(self._current_task_id, section_progress, f"Writing {section_name}")
+                return section_content
+            
+            # Sections only depend on the outline and analysis, so write them concurrently
+            section_contents = await asyncio.gather(*(write_section(name) for name in section_names))
+            sections = dict(zip(section_names, section_contents))
             
             state["sections"] = sections
             state["current_step"] = "content_complete"
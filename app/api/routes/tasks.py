@@ -95,16 +95,17 @@ async def get_task_status(
 async def get_user_tasks(
     authorization: Optional[str] = Header(None),
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[datetime] = None
 ):
-    """ユーザーのタスク一覧を取得"""
+    """ユーザーのタスク一覧を取得（次ページはレスポンスのnext_cursorをcursorに指定）"""
     try:
         user_id = await get_user_id_from_auth(authorization)
         if not user_id:
             raise HTTPException(status_code=401, detail="Authentication required")
         
-        tasks = await task_service.get_user_tasks(user_id, limit, offset)
-        return {"tasks": tasks}
+        tasks, next_cursor = await task_service.get_user_tasks(user_id, limit, offset, cursor)
+        return {"tasks": tasks, "next_cursor": next_cursor}
         
     except Exception as e:
         print(f"Error in get_user_tasks: {str(e)}")
@@ -152,7 +153,7 @@ async def stream_task_progress(
             
             # 進捗ストリーミング
             async for progress_update in task_service.stream_task_progress(task_id, user_id):
-                yield f"data: {json.dumps(progress_update.dict())}\n\n"
+                yield f"data: {progress_update.model_dump_json()}\n\n"
                 
                 # タスクが完了またはエラーの場合はストリーミングを終了
                 if progress_update.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
@@ -9,6 +9,7 @@ class Settings(BaseSettings):
     # アプリケーション設定
     APP_NAME: str = "ChatLLM API"
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
     
     # CORS設定
     CORS_ORIGINS: List[str] = [
@@ -0,0 +1,41 @@
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: str = "INFO") -> None:
+    """ルートロガーにQueueHandlerを設定し、実際の出力はバックグラウンドスレッドで行う
+
+    levelはアプリ（app.*）のロガーにのみ適用し、サードパーティのロガーはWARNINGのままにする
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(level)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """キューに残ったログを書き出してリスナースレッドを停止"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes.chat import router as chat_router
 from app.api.routes.models import router as models_router
@@ -6,8 +7,9 @@ from app.api.routes.tasks import router as tasks_router
 from app.api.routes.knowledge import router as knowledge_router
 from app.api.websockets.chat import router as ws_chat_router
 from app.core.config import settings
+from app.core.logging_config import setup_logging, shutdown_logging
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.services.openai_service import openai_service
@@ -20,7 +22,24 @@ try:
 except ImportError:
     FIREBASE_AVAILABLE = False
 
-app = FastAPI(title="ChatLLM API", debug=True)
+# ログ出力はキュー経由でバックグラウンドスレッドに任せる
+setup_logging(settings.LOG_LEVEL)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 終了時: HTTPセッションを閉じ、保留中のタスク進捗を書き込んでからログを書き出す
+    from app.services.pubmed_service import pubmed_service
+    from app.services.task_service import task_service
+    try:
+        await pubmed_service.close()
+    finally:
+        try:
+            await task_service.flush()
+        finally:
+            shutdown_logging()
+
+app = FastAPI(title="ChatLLM API", debug=True, default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # CORSミドルウェアの設定
 app.add_middleware(
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, AsyncGenerator
+from typing import Dict, List, Any, Optional, AsyncGenerator, Mapping
+from types import MappingProxyType
 from datetime import datetime
 import asyncio
 import uuid
@@ -248,6 +249,7 @@ class AgentOrchestrator:
     
     def __init__(self):
         self.agents: Dict[str, BaseAgent] = {}
+        self._agent_listing: Optional[Dict[str, str]] = None
         self._register_default_agents()
     
     def _register_default_agents(self):
@@ -270,18 +272,23 @@ class AgentOrchestrator:
     def register_agent(self, agent_id: str, agent: BaseAgent):
         """Register a new agent"""
         self.agents[agent_id] = agent
+        self._agent_listing = None
         print(f"🤖 Registered agent: {agent_id} ({agent.name})")
     
     def get_agent(self, agent_id: str) -> Optional[BaseAgent]:
         """Get an agent by ID"""
         return self.agents.get(agent_id)
     
-    def list_agents(self) -> Dict[str, str]:
+    def list_agents(self) -> Mapping[str, str]:
         """List all registered agents"""
-        return {
-            agent_id: agent.description 
-            for agent_id, agent in self.agents.items()
-        }
+        # The registry only changes through register_agent, so build once
+        if self._agent_listing is None:
+            self._agent_listing = {
+                agent_id: agent.description 
+                for agent_id, agent in self.agents.items()
+            }
+        # Hand out a read-only view so callers cannot modify the cached listing
+        return MappingProxyType(self._agent_listing)
     
     async def execute_task(
         self, 
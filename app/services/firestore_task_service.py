@@ -192,7 +192,7 @@ class FirestoreTaskService:
     
     def _task_to_firestore_dict(self, task_progress: TaskProgress) -> Dict[str, Any]:
         """Convert TaskProgress to Firestore-compatible dictionary"""
-        task_dict = task_progress.dict()
+        task_dict = task_progress.model_dump()
         
         # Convert datetime objects to Firestore Timestamps
         for key, value in task_dict.items():
@@ -209,7 +209,7 @@ class FirestoreTaskService:
                 if hasattr(value, 'timestamp'):  # Firestore Timestamp
                     task_data[key] = value.to_datetime()
             
-            return TaskProgress(**task_data)
+            return TaskProgress.model_validate(task_data)
             
         except Exception as e:
             print(f"❌ Error converting Firestore data to TaskProgress: {str(e)}")
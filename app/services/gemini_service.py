@@ -135,7 +135,7 @@ class GeminiService:
             )
             
             print(f"  Calling Vertex AI API...")
-            response = client_to_use.models.generate_content(
+            response = await client_to_use.aio.models.generate_content(
                 model=vertex_model_name,
                 contents=contents,
                 config=config
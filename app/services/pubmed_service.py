@@ -10,6 +10,26 @@ from typing import Dict, List, Any, Optional, NamedTuple
 from datetime import datetime, timedelta
 from urllib.parse import quote
 import re
+from collections import Counter
+
+# Tokenizer patterns used for every fetched paper, compiled once
+_KEYWORD_TOKEN = re.compile(r'\b[a-zA-Z]{4,}\b')
+_WHITESPACE_RUN = re.compile(r'\s+')
+
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 
+    'has', 'had', 'will', 'would', 'could', 'should', 'this', 'that', 
+    'these', 'those', 'we', 'they', 'our', 'their'
+})
+
+# NCBI E-utilities allow ~3 requests/second without an API key; keep a
+# small pool of persistent connections and reuse them between searches
+PUBMED_CONNECTIONS_PER_HOST = 4
+PUBMED_KEEPALIVE_SECONDS = 60
+
+# EFetch accepts up to 200 comma-separated ids in a single GET request
+EFETCH_BATCH_SIZE = 200
 
 class PubMedPaper(NamedTuple):
     """Structure for PubMed paper information"""
@@ -35,9 +55,16 @@ class PubMedService:
         
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create HTTP session"""
-        if self.session is None:
+        if self.session is None or self.session.closed:
             timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(timeout=timeout)
+            connector = aiohttp.TCPConnector(
+                limit_per_host=PUBMED_CONNECTIONS_PER_HOST,
+                keepalive_timeout=PUBMED_KEEPALIVE_SECONDS
+            )
+            self.session = aiohttp.ClientSession(
+                timeout=timeout,
+                connector=connector
+            )
         return self.session
     
     async def close(self):
@@ -148,10 +175,14 @@ class PubMedService:
             session = await self._get_session()
             
             # Process in batches to avoid overwhelming the API
-            batch_size = 20
+            batch_size = EFETCH_BATCH_SIZE
             all_papers = []
             
             for i in range(0, len(pmids), batch_size):
+                if i:
+                    # Be nice to the API
+                    await asyncio.sleep(0.5)
+                
                 batch_pmids = pmids[i:i + batch_size]
                 
                 # EFetch parameters
@@ -173,9 +204,6 @@ class PubMedService:
                     xml_data = await response.text()
                     papers = self._parse_pubmed_xml(xml_data, include_abstracts)
                     all_papers.extend(papers)
-                
-                # Be nice to the API
-                await asyncio.sleep(0.5)
             
             return all_papers
             
@@ -349,20 +377,11 @@ class PubMedService:
     
     def _extract_keywords_from_text(self, text: str) -> List[str]:
         """Simple keyword extraction from text"""
-        # Remove common stop words and extract meaningful terms
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-            'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 
-            'has', 'had', 'will', 'would', 'could', 'should', 'this', 'that', 
-            'these', 'those', 'we', 'they', 'our', 'their'
-        }
-        
         # Extract words (letters only, 4+ characters)
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
+        words = _KEYWORD_TOKEN.findall(text.lower())
         
-        # Filter and count
-        from collections import Counter
-        filtered_words = [word for word in words if word not in stop_words]
+        # Remove common stop words and count meaningful terms
+        filtered_words = [word for word in words if word not in _STOP_WORDS]
         word_counts = Counter(filtered_words)
         
         # Return top keywords
@@ -374,7 +393,7 @@ class PubMedService:
             return ""
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RUN.sub(' ', text)
         
         # Remove special XML characters
         text = text.replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&')
@@ -1,67 +1,112 @@
 import asyncio
+import hashlib
 import json
-from typing import Dict, List, Optional, AsyncGenerator, Any
+import logging
+import os
+import struct
+import tempfile
+import time
+import weakref
+import aiofiles
+import msgspec
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, AsyncGenerator, Any, Tuple
 from datetime import datetime, timedelta
+from app.core.config import settings
 from app.models.schemas import (
     TaskRequest, TaskProgress, TaskStatus, TaskType, AgentStep
 )
 from app.services.firebase_service import firebase_service
 from app.services.firestore_session_service import FirestoreSessionService
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# タスク進捗キャッシュの有効期間（秒）と最大エントリ数
+PROGRESS_CACHE_TTL = 0.5
+PROGRESS_CACHE_SIZE = 1024
+
+# ユーザー別インデックスの各フレームの長さプレフィックス
+_INDEX_FRAME = struct.Struct('<I')
+
 class TaskService:
+    # ローカル保存用のmsgpackエンコーダ/デコーダ
+    _encoder = msgspec.msgpack.Encoder()
+    _decoder = msgspec.msgpack.Decoder(type=dict)
+    _index_decoder = msgspec.msgpack.Decoder(type=Tuple[str, float])
+    
     def __init__(self):
         """タスク管理サービスの初期化"""
         self.firestore_service = FirestoreSessionService()
-        self.running_tasks: Dict[str, asyncio.Task] = {}
+        self.running_tasks: weakref.WeakValueDictionary[str, asyncio.Task] = weakref.WeakValueDictionary()
+        self._db = None
+        self._tasks_col = None
+        self._tasks_lock = asyncio.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_results: Dict[str, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._progress_cache: "OrderedDict[str, Tuple[float, Optional[TaskProgress]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._cache_generation = 0
+        self._local_events: Dict[str, asyncio.Event] = defaultdict(asyncio.Event)
+        self._local_waiters: Dict[str, int] = defaultdict(int)
+    
+    async def _tasks(self):
+        """tasksコレクションの参照を取得（初回のみ解決してキャッシュ）"""
+        if self._tasks_col is None:
+            async with self._tasks_lock:
+                if self._tasks_col is None:
+                    self._db = firebase_service.get_firestore_client()
+                    self._tasks_col = self._db.collection('tasks')
+        return self._tasks_col
         
     async def create_task(self, task_progress: TaskProgress) -> bool:
         """新しいタスクをFirestoreに作成"""
         try:
             if not firebase_service.is_available():
-                print("⚠️ Firebase not available, using local storage")
+                logger.warning("Firebase not available, using local storage")
                 return await self._create_task_local(task_progress)
             
-            db = firebase_service.get_firestore_client()
-            task_ref = db.collection('tasks').document(task_progress.task_id)
+            task_ref = (await self._tasks()).document(task_progress.task_id)
             
-            task_data = task_progress.dict()
+            task_data = task_progress.model_dump()
             # datetimeオブジェクトをFirestore Timestampに変換
             task_data['created_at'] = task_progress.created_at
             task_data['updated_at'] = task_progress.updated_at
             
-            task_ref.set(task_data)
-            print(f"✅ Task {task_progress.task_id} created in Firestore")
+            await asyncio.to_thread(task_ref.set, task_data)
+            logger.debug("Task %s created in Firestore", task_progress.task_id)
             return True
             
         except Exception as e:
-            print(f"❌ Error creating task: {str(e)}")
+            logger.error("Error creating task: %s", e)
             return False
     
     async def _create_task_local(self, task_progress: TaskProgress) -> bool:
         """ローカルファイルにタスクを保存（Firestore利用不可時のフォールバック）"""
         try:
-            import os
-            import json
-            
             tasks_dir = "local_tasks"
             os.makedirs(tasks_dir, exist_ok=True)
             
-            task_file = os.path.join(tasks_dir, f"{task_progress.task_id}.json")
-            task_data = task_progress.dict()
+            task_file = os.path.join(tasks_dir, f"{task_progress.task_id}.mpk")
+            task_data = task_progress.model_dump()
             
-            # datetimeをISO文字列に変換
-            for key, value in task_data.items():
-                if isinstance(value, datetime):
-                    task_data[key] = value.isoformat()
+            self._write_local_task(task_file, task_data)
             
-            with open(task_file, 'w', encoding='utf-8') as f:
-                json.dump(task_data, f, ensure_ascii=False, indent=2)
+            self._append_user_index(
+                task_progress.user_id, task_progress.task_id, task_progress.created_at
+            )
             
-            print(f"✅ Task {task_progress.task_id} created locally")
+            logger.debug("Task %s created locally", task_progress.task_id)
             return True
             
         except Exception as e:
-            print(f"❌ Error creating local task: {str(e)}")
+            logger.error("Error creating local task: %s", e)
             return False
     
     async def get_task_progress(self, task_id: str, user_id: str) -> Optional[TaskProgress]:
@@ -70,54 +115,76 @@ class TaskService:
             if not firebase_service.is_available():
                 return await self._get_task_progress_local(task_id, user_id)
             
-            db = firebase_service.get_firestore_client()
-            task_ref = db.collection('tasks').document(task_id)
-            task_doc = task_ref.get()
-            
-            if not task_doc.exists:
-                return None
-            
-            task_data = task_doc.to_dict()
+            task_progress = await self._get_task_progress_cached(task_id)
             
             # ユーザー権限チェック
-            if task_data.get('user_id') != user_id:
+            if task_progress is None or task_progress.user_id != user_id:
                 return None
             
-            return TaskProgress(**task_data)
+            return task_progress
             
         except Exception as e:
-            print(f"❌ Error getting task progress: {str(e)}")
+            logger.error("Error getting task progress: %s", e)
             return None
     
+    async def _get_task_progress_cached(self, task_id: str) -> Optional[TaskProgress]:
+        """キャッシュ経由でタスクを取得（同時リクエストは1回の読み取りに集約）"""
+        cached = self._progress_cache.get(task_id)
+        if cached and time.monotonic() - cached[0] < PROGRESS_CACHE_TTL:
+            return cached[1]
+        
+        fetch = self._inflight.get(task_id)
+        if fetch is None:
+            fetch = asyncio.create_task(self._fetch_task_progress(task_id))
+            self._inflight[task_id] = fetch
+            fetch.add_done_callback(lambda done: self._forget_fetch(task_id, done))
+        
+        return await asyncio.shield(fetch)
+    
+    def _forget_fetch(self, task_id: str, fetch: asyncio.Task):
+        """完了した読み取りを外す（無効化後に始まった新しい読み取りは残す）"""
+        if self._inflight.get(task_id) is fetch:
+            del self._inflight[task_id]
+    
+    async def _fetch_task_progress(self, task_id: str) -> Optional[TaskProgress]:
+        """Firestoreからタスクを読み取りキャッシュに格納"""
+        generation = self._cache_generation
+        task_ref = (await self._tasks()).document(task_id)
+        task_doc = await asyncio.to_thread(task_ref.get)
+        
+        task_progress = None
+        if task_doc.exists:
+            task_progress = TaskProgress.model_validate(task_doc.to_dict())
+        
+        # 読み取り中に進捗が書き込まれた場合、書き込み前の内容はキャッシュしない
+        if generation != self._cache_generation:
+            return task_progress
+        
+        self._progress_cache[task_id] = (time.monotonic(), task_progress)
+        self._progress_cache.move_to_end(task_id)
+        if len(self._progress_cache) > PROGRESS_CACHE_SIZE:
+            self._progress_cache.popitem(last=False)
+        
+        return task_progress
+    
     async def _get_task_progress_local(self, task_id: str, user_id: str) -> Optional[TaskProgress]:
         """ローカルファイルからタスク進捗を取得"""
         try:
-            import os
-            import json
-            
-            task_file = os.path.join("local_tasks", f"{task_id}.json")
+            task_file = os.path.join("local_tasks", f"{task_id}.mpk")
             if not os.path.exists(task_file):
                 return None
             
-            with open(task_file, 'r', encoding='utf-8') as f:
-                task_data = json.load(f)
+            with open(task_file, 'rb') as f:
+                task_data = self._decoder.decode(f.read())
             
             # ユーザー権限チェック
             if task_data.get('user_id') != user_id:
                 return None
             
-            # ISO文字列をdatetimeに変換
-            for key, value in task_data.items():
-                if key.endswith('_at') and isinstance(value, str):
-                    try:
-                        task_data[key] = datetime.fromisoformat(value)
-                    except ValueError:
-                        pass
-            
-            return TaskProgress(**task_data)
+            return TaskProgress.model_validate(task_data)
             
         except Exception as e:
-            print(f"❌ Error getting local task progress: {str(e)}")
+            logger.error("Error getting local task progress: %s", e)
             return None
     
     async def update_task_progress(
@@ -133,14 +200,17 @@ class TaskService:
     ) -> bool:
         """タスクの進捗を更新"""
         try:
+            now = datetime.now()
             update_data = {
-                'updated_at': datetime.now()
+                'updated_at': now
             }
+            is_terminal = False
             
             if status:
                 update_data['status'] = status.value
                 if status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
-                    update_data['completed_at'] = datetime.now()
+                    update_data['completed_at'] = now
+                    is_terminal = True
             
             if progress_percentage is not None:
                 update_data['progress_percentage'] = progress_percentage
@@ -163,118 +233,297 @@ class TaskService:
             if not firebase_service.is_available():
                 return await self._update_task_progress_local(task_id, update_data)
             
-            db = firebase_service.get_firestore_client()
-            task_ref = db.collection('tasks').document(task_id)
-            task_ref.update(update_data)
+            # 短時間の更新はまとめてWriteBatchで書き込む
+            self._pending.setdefault(task_id, {}).update(update_data)
+            
+            if is_terminal:
+                # 完了系のステータスは順序を保証するため即時書き込み
+                # （待機中の遅延書き込みは取り消し、実行中の書き込みはロックで完了を待つ）
+                # 書き込み結果はこの更新を含むバッチから受け取る（先行する書き込みに拾われた場合も同様）
+                result = self._pending_results.get(task_id)
+                if result is None:
+                    result = asyncio.get_running_loop().create_future()
+                    self._pending_results[task_id] = result
+                self._cancel_scheduled_flush()
+                await self._flush_pending()
+                return await result
+            
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_after(0.05))
             
-            print(f"✅ Task {task_id} progress updated")
             return True
             
         except Exception as e:
-            print(f"❌ Error updating task progress: {str(e)}")
+            logger.error("Error updating task progress: %s", e)
             return False
     
+    def _cancel_scheduled_flush(self):
+        """まだ待機中の遅延書き込みを取り消す"""
+        # _flush_afterは待機後すぐに_flush_taskをNoneに戻すため、
+        # ここで参照できるのは書き込み開始前のタスクのみ
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+    
+    async def _flush_after(self, delay: float):
+        """一定時間待機した後に保留中の進捗更新を書き込む"""
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        await self._flush_pending()
+    
+    async def flush(self):
+        """保留中の進捗更新をすべて書き込む（シャットダウン時用）"""
+        self._cancel_scheduled_flush()
+        await self._flush_pending()
+    
+    async def _flush_pending(self) -> bool:
+        """保留中の進捗更新をWriteBatchで一括書き込み
+        
+        書き込みはロックで1つずつ実行し、古い更新が新しい更新の後に届かないようにする。
+        完了系の更新を待つ呼び出し元には、そのタスクの書き込み結果を通知する。
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return True
+            
+            pending, self._pending = self._pending, {}
+            results, self._pending_results = self._pending_results, {}
+            try:
+                tasks_col = await self._tasks()
+            except Exception as e:
+                logger.error("Lost progress updates for tasks %s: %s", ', '.join(pending), e)
+                self._set_flush_results(results, set(pending))
+                return False
+            
+            try:
+                batch = self._db.batch()
+                for pending_task_id, data in pending.items():
+                    batch.update(tasks_col.document(pending_task_id), data)
+                
+                await asyncio.to_thread(batch.commit)
+                failed = set()
+                
+            except Exception as e:
+                # WriteBatchは1件でも失敗すると全体が失敗するため、タスクごとに書き直す
+                logger.warning("Batched task progress update failed, retrying per task: %s", e)
+                failed = await self._update_each(tasks_col, pending)
+            
+            # 書き込んだタスクのキャッシュと、書き込み前に始まった読み取りを無効化
+            self._cache_generation += 1
+            for pending_task_id in pending:
+                self._progress_cache.pop(pending_task_id, None)
+                self._inflight.pop(pending_task_id, None)
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Task progress updated: %s", ', '.join(pending.keys() - failed))
+            
+            self._set_flush_results(results, failed)
+            return not failed
+    
+    def _set_flush_results(self, results: Dict[str, asyncio.Future], failed: set):
+        """完了系の更新を待つ呼び出し元にタスクごとの書き込み結果を通知"""
+        for pending_task_id, result in results.items():
+            if not result.done():
+                result.set_result(pending_task_id not in failed)
+    
+    async def _update_each(self, tasks_col, pending: Dict[str, Dict[str, Any]]) -> set:
+        """進捗更新をタスクごとに書き込み、失敗したタスクIDを返す"""
+        failed = set()
+        for pending_task_id, data in pending.items():
+            try:
+                await asyncio.to_thread(tasks_col.document(pending_task_id).update, data)
+            except Exception as e:
+                logger.error("Lost progress update for task %s: %s", pending_task_id, e)
+                failed.add(pending_task_id)
+        return failed
+    
     async def _update_task_progress_local(self, task_id: str, update_data: Dict[str, Any]) -> bool:
         """ローカルファイルのタスク進捗を更新"""
         try:
-            import os
-            import json
-            
-            task_file = os.path.join("local_tasks", f"{task_id}.json")
+            task_file = os.path.join("local_tasks", f"{task_id}.mpk")
             if not os.path.exists(task_file):
                 return False
             
-            with open(task_file, 'r', encoding='utf-8') as f:
-                task_data = json.load(f)
+            with open(task_file, 'rb') as f:
+                task_data = self._decoder.decode(f.read())
             
             # 更新データをマージ
-            for key, value in update_data.items():
-                if isinstance(value, datetime):
-                    task_data[key] = value.isoformat()
-                else:
-                    task_data[key] = value
+            task_data.update(update_data)
             
-            with open(task_file, 'w', encoding='utf-8') as f:
-                json.dump(task_data, f, ensure_ascii=False, indent=2)
+            self._write_local_task(task_file, task_data)
+            
+            # 待機中のストリームに更新を通知（次の待機には新しいイベントを使う）
+            event = self._local_events.pop(task_id, None)
+            if event is not None:
+                event.set()
             
             return True
             
         except Exception as e:
-            print(f"❌ Error updating local task progress: {str(e)}")
+            logger.error("Error updating local task progress: %s", e)
             return False
     
-    async def get_user_tasks(self, user_id: str, limit: int = 50, offset: int = 0) -> List[TaskProgress]:
-        """ユーザーのタスク一覧を取得"""
+    def _write_local_task(self, task_file: str, task_data: Dict[str, Any]):
+        """タスクをmsgpackで保存（DEBUG時は確認用に同名の.jsonも書き出す）"""
+        # 一時ファイルに書いてから置き換え、読み込み側には書き込み途中の内容を見せない
+        fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(task_file), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._encoder.encode(task_data))
+            os.replace(tmp_file, task_file)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
+        
+        if settings.DEBUG:
+            json_file = os.path.splitext(task_file)[0] + ".json"
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(task_data, f, ensure_ascii=False, indent=2, default=str)
+    
+    async def get_user_tasks(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0,
+        cursor_created_at: Optional[datetime] = None
+    ) -> Tuple[List[TaskProgress], Optional[datetime]]:
+        """ユーザーのタスク一覧と次ページ用のカーソルを取得
+        
+        cursor_created_atを指定した場合はその作成日時より古いタスクから取得する
+        （offsetより優先）。次ページがない場合、カーソルはNoneを返す。
+        """
+        if limit <= 0:
+            return [], None
+        
         try:
             if not firebase_service.is_available():
-                return await self._get_user_tasks_local(user_id, limit, offset)
-            
-            db = firebase_service.get_firestore_client()
-            query = db.collection('tasks')\
-                     .where('user_id', '==', user_id)\
-                     .order_by('created_at', direction='desc')\
-                     .limit(limit)\
-                     .offset(offset)
-            
-            docs = query.get()
-            tasks = []
-            for doc in docs:
-                task_data = doc.to_dict()
-                tasks.append(TaskProgress(**task_data))
+                return await self._get_user_tasks_local(user_id, limit, offset, cursor_created_at)
+            else:
+                tasks_col = await self._tasks()
+                query = tasks_col.where('user_id', '==', user_id)\
+                         .order_by('created_at', direction='desc')
+                
+                # カーソル指定時はFirestoreにスキップ分を読ませない
+                if cursor_created_at is not None:
+                    query = query.start_after({'created_at': cursor_created_at})
+                elif offset:
+                    query = query.offset(offset)
+                
+                docs = await asyncio.to_thread(query.limit(limit).get)
+                tasks = []
+                next_cursor = None
+                for doc in docs:
+                    task_data = doc.to_dict()
+                    next_cursor = task_data.get('created_at')
+                    tasks.append(TaskProgress.model_validate(task_data))
             
-            return tasks
+            # カーソルは読み込んだドキュメントから決める
+            return tasks, next_cursor if len(docs) == limit else None
             
         except Exception as e:
-            print(f"❌ Error getting user tasks: {str(e)}")
-            return []
+            logger.error("Error getting user tasks: %s", e)
+            return [], None
     
-    async def _get_user_tasks_local(self, user_id: str, limit: int = 50, offset: int = 0) -> List[TaskProgress]:
-        """ローカルファイルからユーザーのタスク一覧を取得"""
+    async def _get_user_tasks_local(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0,
+        cursor_created_at: Optional[datetime] = None
+    ) -> Tuple[List[TaskProgress], Optional[datetime]]:
+        """ローカルファイルからユーザーのタスク一覧と次ページ用のカーソルを取得"""
         try:
-            import os
-            import json
-            
             tasks_dir = "local_tasks"
             if not os.path.exists(tasks_dir):
-                return []
+                return [], None
+            
+            # インデックスを作成日時でソートしてページ分のみ読み込む
+            entries = self._read_user_index(user_id)
+            if cursor_created_at is not None:
+                cursor_ts = cursor_created_at.timestamp()
+                entries = [entry for entry in entries if entry[1] < cursor_ts]
+                offset = 0
+            entries.sort(key=lambda entry: entry[1], reverse=True)
+            
+            # ページ分のタスクファイルを並行して読み込む
+            page = entries[offset:offset + limit]
+            contents = await asyncio.gather(*(
+                self._read_task_file(os.path.join(tasks_dir, f"{task_id}.mpk"))
+                for task_id, _ in page
+            ))
             
             tasks = []
-            for filename in os.listdir(tasks_dir):
-                if filename.endswith('.json'):
+            for task_data in contents:
+                if task_data and task_data.get('user_id') == user_id:
                     try:
-                        with open(os.path.join(tasks_dir, filename), 'r', encoding='utf-8') as f:
-                            task_data = json.load(f)
-                        
-                        if task_data.get('user_id') == user_id:
-                            # ISO文字列をdatetimeに変換
-                            for key, value in task_data.items():
-                                if key.endswith('_at') and isinstance(value, str):
-                                    try:
-                                        task_data[key] = datetime.fromisoformat(value)
-                                    except ValueError:
-                                        pass
-                            
-                            tasks.append(TaskProgress(**task_data))
+                        tasks.append(TaskProgress.model_validate(task_data))
                     except Exception:
                         continue
             
-            # 作成日時でソート
-            tasks.sort(key=lambda x: x.created_at, reverse=True)
-            
-            # ページネーション
-            return tasks[offset:offset + limit]
+            # 読めずに飛ばしたタスクがあってもページ送りが止まらないよう、カーソルはインデックスから決める
+            next_cursor = datetime.fromtimestamp(page[-1][1]) if len(page) == limit else None
+            return tasks, next_cursor
             
         except Exception as e:
-            print(f"❌ Error getting local user tasks: {str(e)}")
+            logger.error("Error getting local user tasks: %s", e)
+            return [], None
+    
+    async def _read_task_file(self, task_file: str) -> Optional[Dict[str, Any]]:
+        """タスクファイルを非同期に読み込みデコード（読めない場合はNone）"""
+        try:
+            async with aiofiles.open(task_file, 'rb') as f:
+                return self._decoder.decode(await f.read())
+        except Exception:
+            return None
+    
+    def _user_index_path(self, user_id: str) -> str:
+        """ユーザー別タスクインデックスのパス（user_idはハッシュ化してファイル名に使用）"""
+        digest = hashlib.blake2b(user_id.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join("local_tasks", f"_index_{digest}.mpk")
+    
+    def _append_user_index(self, user_id: str, task_id: str, created_at: datetime):
+        """ユーザー別インデックスに (task_id, created_at) を追記"""
+        frame = self._encoder.encode((task_id, created_at.timestamp()))
+        with open(self._user_index_path(user_id), 'ab') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(_INDEX_FRAME.pack(len(frame)) + frame)
+    
+    def _read_user_index(self, user_id: str) -> List[Tuple[str, float]]:
+        """ユーザー別インデックスを読み込む"""
+        index_file = self._user_index_path(user_id)
+        if not os.path.exists(index_file):
             return []
+        
+        with open(index_file, 'rb') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_SH)
+            data = memoryview(f.read())
+        
+        entries = []
+        pos = 0
+        while pos + _INDEX_FRAME.size <= len(data):
+            (size,) = _INDEX_FRAME.unpack_from(data, pos)
+            pos += _INDEX_FRAME.size
+            if pos + size > len(data):
+                # 追記途中の末尾フレームは読み飛ばす
+                break
+            entries.append(self._index_decoder.decode(data[pos:pos + size]))
+            pos += size
+        
+        return entries
     
     async def cancel_task(self, task_id: str, user_id: str) -> bool:
         """タスクをキャンセル"""
         try:
+            # 他のユーザーのタスクは停止させない
+            if await self.get_task_progress(task_id, user_id) is None:
+                return False
+            
             # 実行中のタスクがあれば停止
-            if task_id in self.running_tasks:
-                self.running_tasks[task_id].cancel()
-                del self.running_tasks[task_id]
+            running_task = self.running_tasks.pop(task_id, None)
+            if running_task is not None:
+                running_task.cancel()
             
             # ステータスを更新
             return await self.update_task_progress(
@@ -283,13 +532,21 @@ class TaskService:
             )
             
         except Exception as e:
-            print(f"❌ Error cancelling task: {str(e)}")
+            logger.error("Error cancelling task: %s", e)
             return False
     
     async def execute_task_background(self, task_id: str, user_id: str, request: TaskRequest):
         """バックグラウンドでタスクを実行"""
+        # キャンセル可能なasyncio.Taskとして実行し、完了時に実行中タスクから外す
+        task = asyncio.create_task(self._run_task(task_id, request))
+        self.running_tasks[task_id] = task
+        task.add_done_callback(lambda _t, tid=task_id: self.running_tasks.pop(tid, None))
+        await task
+    
+    async def _run_task(self, task_id: str, request: TaskRequest):
+        """タスクタイプに応じてタスクを実行し、結果のステータスを記録"""
         try:
-            print(f"🚀 Starting background task execution: {task_id}")
+            logger.info("Starting background task execution: %s", task_id)
             
             # タスクを実行中に更新
             await self.update_task_progress(
@@ -309,22 +566,18 @@ class TaskService:
                 raise ValueError(f"Unknown task type: {request.task_type}")
             
         except asyncio.CancelledError:
-            print(f"⚠️ Task {task_id} was cancelled")
+            logger.warning("Task %s was cancelled", task_id)
             await self.update_task_progress(
                 task_id=task_id,
                 status=TaskStatus.CANCELLED
             )
         except Exception as e:
-            print(f"❌ Error in background task execution: {str(e)}")
+            logger.error("Error in background task execution: %s", e)
             await self.update_task_progress(
                 task_id=task_id,
                 status=TaskStatus.FAILED,
                 error_message=str(e)
             )
-        finally:
-            # 実行中タスクリストから削除
-            if task_id in self.running_tasks:
-                del self.running_tasks[task_id]
     
     async def _execute_simple_chat(self, task_id: str, request: TaskRequest):
         """シンプルチャットタスクの実行（LangChainエージェント使用）"""
@@ -421,9 +674,15 @@ class TaskService:
     
     async def stream_task_progress(self, task_id: str, user_id: str) -> AsyncGenerator[TaskProgress, None]:
         """タスク進捗のリアルタイムストリーミング"""
+        self._local_waiters[task_id] += 1
         try:
             last_update = None
             while True:
+                # ローカル保存時は読み込み前に更新通知用イベントを取得しておく
+                local_event = None
+                if not firebase_service.is_available():
+                    local_event = self._local_events[task_id]
+                
                 current_progress = await self.get_task_progress(task_id, user_id)
                 
                 if not current_progress:
@@ -438,10 +697,23 @@ class TaskService:
                 if current_progress.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
                     break
                 
-                await asyncio.sleep(1)  # 1秒間隔でポーリング
+                if local_event is not None:
+                    # 更新通知を待機（取りこぼし対策としてタイムアウト後に再読み込み）
+                    try:
+                        await asyncio.wait_for(local_event.wait(), timeout=30)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await asyncio.sleep(1)  # 1秒間隔でポーリング
                 
         except Exception as e:
-            print(f"❌ Error in stream_task_progress: {str(e)}")
+            logger.error("Error in stream_task_progress: %s", e)
+        finally:
+            # 最後の購読者が抜けたら通知用イベントを破棄
+            self._local_waiters[task_id] -= 1
+            if not self._local_waiters[task_id]:
+                del self._local_waiters[task_id]
+                self._local_events.pop(task_id, None)
 
 # シングルトンインスタンス
 task_service = TaskService()
\ No newline at end of file
@@ -3,17 +3,90 @@ Translation Service for Japanese-English bidirectional translation
 Handles automatic language detection and translation for research queries
 """
 
+import asyncio
+import hashlib
+import logging
 import re
-from typing import Optional, Dict, Any
-from langchain_core.messages import HumanMessage
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 from app.services.gemini_service import gemini_service
 
+logger = logging.getLogger(__name__)
+
+# Japanese characters (hiragana, katakana, kanji)
+_JAPANESE_CHARS = re.compile(r'[\u3041-\u3096\u30a1-\u30fe\u4e00-\u9faf]')
+
+# Translation cache lifetime (seconds) and maximum number of entries
+TRANSLATION_CACHE_TTL = 24 * 60 * 60
+TRANSLATION_CACHE_SIZE = 2048
+
+# Upper bound on concurrent Gemini translation calls
+# (send_message awaits the async Gemini client, so calls from concurrent requests overlap)
+MAX_CONCURRENT_TRANSLATIONS = 8
+_gemini_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSLATIONS)
+
+# Translation prompts (filled with str.format per call)
+_EN_PROMPT = """
+Translate the following Japanese text to English for academic/medical research purposes.
+
+Requirements:
+- Use precise medical and scientific terminology
+- Maintain technical accuracy
+- Optimize for academic database searches (PubMed, etc.)
+- Use standard English academic phrases
+- Do not add explanations, just provide the translation
+
+Japanese text: "{text}"
+
+English translation:"""
+
+_JA_PROMPT = """
+Translate the following English text to natural Japanese.
+
+Requirements:
+- Use appropriate Japanese medical/scientific terminology
+- Maintain academic tone and accuracy
+- Use natural Japanese expression
+- Preserve technical meaning
+- Do not add explanations, just provide the translation
+
+English text: "{text}"
+
+Japanese translation:"""
+
 
 class TranslationService:
     """Service for handling Japanese-English translations using Gemini"""
     
     def __init__(self):
         self.gemini_service = gemini_service
+        self._cache: "OrderedDict[Tuple[str, bytes], Tuple[float, str]]" = OrderedDict()
+    
+    def _cache_key(self, target_language: str, text: str) -> Tuple[str, bytes]:
+        """Build a per-language cache key from a digest of the source text"""
+        return target_language, hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+    
+    def _get_cached(self, key: Tuple[str, bytes]) -> Optional[str]:
+        """Return a cached translation if present and not expired"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        
+        cached_at, translation = entry
+        if time.monotonic() - cached_at > TRANSLATION_CACHE_TTL:
+            del self._cache[key]
+            return None
+        
+        self._cache.move_to_end(key)
+        return translation
+    
+    def _set_cached(self, key: Tuple[str, bytes], translation: str):
+        """Store a translation, evicting the least recently used entry when full"""
+        self._cache[key] = (time.monotonic(), translation)
+        self._cache.move_to_end(key)
+        if len(self._cache) > TRANSLATION_CACHE_SIZE:
+            self._cache.popitem(last=False)
     
     def detect_language(self, text: str) -> str:
         """
@@ -21,8 +94,9 @@ class TranslationService:
         Returns: 'ja' for Japanese, 'en' for English
         """
         # Count Japanese characters (hiragana, katakana, kanji)
-        japanese_chars = len(re.findall(r'[ひ-ゖヒ-ヾ一-龯]', text))
-        total_chars = len(re.sub(r'\s', '', text))
+        japanese_chars = len(_JAPANESE_CHARS.findall(text))
+        # Count non-whitespace characters
+        total_chars = sum(map(len, text.split()))
         
         if total_chars == 0:
             return 'en'
@@ -32,32 +106,26 @@ class TranslationService:
         # If more than 30% Japanese characters, consider it Japanese
         return 'ja' if japanese_ratio > 0.3 else 'en'
     
-    async def translate_to_english(self, japanese_text: str) -> str:
+    async def translate_to_english(self, japanese_text: str, do_not_cache: bool = False) -> str:
         """
         Translate Japanese text to English for academic/medical search
         Optimized for research and medical terminology
+        Set do_not_cache for sensitive text that must not be kept in memory
         """
+        cache_key = self._cache_key('en', japanese_text)
+        if not do_not_cache:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
-            prompt = f"""
-Translate the following Japanese text to English for academic/medical research purposes.
-
-Requirements:
-- Use precise medical and scientific terminology
-- Maintain technical accuracy
-- Optimize for academic database searches (PubMed, etc.)
-- Use standard English academic phrases
-- Do not add explanations, just provide the translation
-
-Japanese text: "{japanese_text}"
-
-English translation:"""
-
-            messages = [HumanMessage(content=prompt)]
-            response = await self.gemini_service.send_message(
-                model_name="gemini-2.0-flash-001",
-                history=[],
-                message=prompt
-            )
+            prompt = _EN_PROMPT.format(text=japanese_text)
+            async with _gemini_semaphore:
+                response = await self.gemini_service.send_message(
+                    model_name="gemini-2.0-flash-001",
+                    history=[],
+                    message=prompt
+                )
             
             # Clean the response to get just the translation
             translation = response.strip().strip('"').strip("'")
@@ -68,38 +136,37 @@ English translation:"""
                 if len(parts) == 2 and len(parts[0]) < 30:
                     translation = parts[1].strip()
             
-            return translation if translation else japanese_text
+            if not translation:
+                return japanese_text
+            
+            if not do_not_cache:
+                self._set_cached(cache_key, translation)
+            return translation
             
         except Exception as e:
-            print(f"❌ Translation to English failed: {str(e)}")
+            logger.error("Translation to English failed: %s", e)
             return japanese_text
     
-    async def translate_to_japanese(self, english_text: str) -> str:
+    async def translate_to_japanese(self, english_text: str, do_not_cache: bool = False) -> str:
         """
         Translate English text to natural Japanese
         Optimized for academic and medical content
+        Set do_not_cache for sensitive text that must not be kept in memory
         """
+        cache_key = self._cache_key('ja', english_text)
+        if not do_not_cache:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
-            prompt = f"""
-Translate the following English text to natural Japanese.
-
-Requirements:
-- Use appropriate Japanese medical/scientific terminology
-- Maintain academic tone and accuracy
-- Use natural Japanese expression
-- Preserve technical meaning
-- Do not add explanations, just provide the translation
-
-English text: "{english_text}"
-
-Japanese translation:"""
-
-            messages = [HumanMessage(content=prompt)]
-            response = await self.gemini_service.send_message(
-                model_name="gemini-2.0-flash-001",
-                history=[],
-                message=prompt
-            )
+            prompt = _JA_PROMPT.format(text=english_text)
+            async with _gemini_semaphore:
+                response = await self.gemini_service.send_message(
+                    model_name="gemini-2.0-flash-001",
+                    history=[],
+                    message=prompt
+                )
             
             # Clean the response to get just the translation
             translation = response.strip().strip('"').strip("'")
@@ -110,10 +177,15 @@ Japanese translation:"""
                 if len(parts) == 2 and len(parts[0]) < 30:
                     translation = parts[1].strip()
             
-            return translation if translation else english_text
+            if not translation:
+                return english_text
+            
+            if not do_not_cache:
+                self._set_cached(cache_key, translation)
+            return translation
             
         except Exception as e:
-            print(f"❌ Translation to Japanese failed: {str(e)}")
+            logger.error("Translation to Japanese failed: %s", e)
             return english_text
     
     async def translate_search_query(self, query: str) -> Dict[str, str]:
@@ -123,7 +195,8 @@ Japanese translation:"""
         Returns:
             Dict with 'original', 'translated', 'original_language', 'search_language'
         """
-        original_language = self.detect_language(query)
+        # Pure ASCII input cannot contain Japanese characters
+        original_language = 'en' if query.isascii() else self.detect_language(query)
         
         if original_language == 'ja':
             # Japanese input -> translate to English for search
@@ -157,8 +230,12 @@ Japanese translation:"""
         if target_language == 'en':
             return english_content
         
-        # Translate to Japanese
-        return await self.translate_to_japanese(english_content)
+        # Content already in the target language needs no translation
+        if self.detect_language(english_content) == target_language:
+            return english_content
+        
+        # Generated reports are unique and large, so keep them out of the cache
+        return await self.translate_to_japanese(english_content, do_not_cache=True)
     
     async def create_bilingual_summary(self, original_query: str, english_results: str) -> str:
         """
@@ -167,14 +244,17 @@ Japanese translation:"""
         original_language = self.detect_language(original_query)
         
         if original_language == 'ja':
-            # Translate results to Japanese
-            japanese_results = await self.translate_to_japanese(english_results)
+            # Translate results and query concurrently
+            japanese_results, english_query = await asyncio.gather(
+                self.translate_to_japanese(english_results, do_not_cache=True),
+                self.translate_to_english(original_query)
+            )
             
             # Create bilingual format
             return f"""# 検索結果 / Search Results
 
 **元の検索クエリ**: {original_query}
-**English Search Query**: {await self.translate_to_english(original_query)}
+**English Search Query**: {english_query}
 
 ---
 
@@ -4,8 +4,19 @@ Quick configuration check for Gemini service
 """
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
+@lru_cache(maxsize=1)
+def _get_genai_client(project_id, location):
+    """Create the Gen AI client once per project/location"""
+    from google import genai
+    return genai.Client(
+        vertexai=True,
+        project=project_id,
+        location=location
+    )
+
 def check_gemini_config():
     load_dotenv()
     
@@ -38,12 +49,7 @@ def check_gemini_config():
     
     # Test basic initialization
     try:
-        from google import genai
-        client = genai.Client(
-            vertexai=True,
-            project=project_id,
-            location=location
-        )
+        client = _get_genai_client(project_id, location)
         print("✅ Google Gen AI client: Created successfully")
         return True
     except Exception as e:
@@ -1,4 +1,49 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+# 出力ファイルの書き込みバッファサイズ（小さな書き込みをまとめる）
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# 並列読み込みのスレッド数と、一度に読み込むファイル数（メモリ使用量の上限）
+READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+READ_BATCH_SIZE = 256
+
+def _walk(folder_path):
+    """os.scandir で再帰的にフォルダを走査し、(ファイル名, パス) を順に返す"""
+    try:
+        with os.scandir(folder_path) as it:
+            entries = list(it)
+    except OSError:
+        # os.walk と同様に読めないフォルダは無視する
+        return
+    subdirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            # os.walk と同様に判定できないもの（リンクのループ等）はファイルとして扱う
+            is_dir = False
+        if not is_dir:
+            # 壊れたリンク等も含め、読み込み時のエラーとして報告する
+            yield entry.name, entry.path
+        elif not entry.is_symlink():
+            # os.walk と同様にフォルダへのシンボリックリンクはたどらない
+            subdirs.append(entry.path)
+    for subdir in subdirs:
+        yield from _walk(subdir)
+
+def _read_utf8(file_path):
+    """ファイルをバイト列で読み込む。UTF-8 で読めない場合は None、エラー時は例外を返す"""
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        data.decode('utf-8')
+        return data
+    except UnicodeDecodeError:
+        return None
+    except Exception as e:
+        return e
 
 def read_and_save_files(folder_path, output_file, extensions=None):
     """
@@ -9,40 +54,56 @@ def read_and_save_files(folder_path, output_file, extensions=None):
         output_file: 出力するテキストファイルのパス
         extensions: 処理する拡張子のリスト（例: ['.ts', '.tsx', '.js']）。Noneの場合はすべてのファイルを処理
     """
-    # 出力ファイルを開く
-    with open(output_file, 'w', encoding='utf-8') as out_f:
+    # 拡張子は先頭の '.' を除いた小文字で集合にしておく
+    exts_set = frozenset(e.lstrip('.').lower() for e in extensions) if extensions else None
+    
+    # Windowsスタイルのパスに変換（WSL環境の場合）するかはフォルダで決まる
+    is_wsl = (folder_path.rstrip('/') + '/').startswith('/mnt/c/')
+    if is_wsl:
+        win_root = 'C:' + folder_path[6:].replace('/', '\\')
+        root_len = len(folder_path)
+    
+    # 出力ファイルを開く（デコード・再エンコードを避けるためバイナリで読み書きする）
+    def candidates():
         # フォルダ内のファイルを走査
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                
-                # Windowsスタイルのパスに変換（WSL環境の場合）
-                if file_path.startswith('/mnt/c/'):
-                    windows_path = 'C:' + file_path[6:].replace('/', '\\')
-                else:
-                    windows_path = file_path
-                
-                # 拡張子フィルタリング
-                _, ext = os.path.splitext(file)
-                if extensions and ext.lower() not in extensions:
+        for file, file_path in _walk(folder_path):
+            # 拡張子フィルタリング
+            if exts_set is not None:
+                dot = file.rfind('.')
+                if dot <= 0 or file[dot + 1:].lower() not in exts_set:
                     continue
-                
-                try:
-                    # ファイルを読み込む
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                    except UnicodeDecodeError:
-                        # UTF-8で読めない場合はスキップ
-                        continue
-                    
-                    # パスと内容を出力ファイルに書き込む（ご要望の形式で）
-                    out_f.write(f"{windows_path}\n{content}\n\n")
-                    print(f"処理: {file_path}")
-                    
-                except Exception as e:
+            
+            # 相対部分だけを変換してフォルダ側の接頭辞につなげる
+            if is_wsl:
+                windows_path = win_root + file_path[root_len:].replace('/', '\\')
+            else:
+                windows_path = file_path
+            yield windows_path, file_path
+    
+    with open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as out_f, \
+            ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+        pending = candidates()
+        while True:
+            batch = list(islice(pending, READ_BATCH_SIZE))
+            if not batch:
+                break
+            
+            # ファイルは並列に読み込み、書き込みは走査順を保つ
+            results = pool.map(_read_utf8, [file_path for _, file_path in batch])
+            for (windows_path, file_path), data in zip(batch, results):
+                if data is None:
+                    # UTF-8で読めない場合はスキップ
+                    continue
+                if isinstance(data, Exception):
                     # エラーが発生した場合はエラーメッセージを出力
-                    print(f"エラー: {file_path} - {str(e)}")
+                    print(f"エラー: {file_path} - {str(data)}")
+                    continue
+                
+                # パスと内容を出力ファイルに書き込む（ご要望の形式で）
+                out_f.write(f"{windows_path}\n".encode('utf-8'))
+                out_f.write(data)
+                out_f.write(b"\n\n")
+                print(f"処理: {file_path}")
     
     print(f"ファイルの内容を {output_file} に保存しました。")
 
@@ -1,5 +1,6 @@
 import uvicorn
 import os
+import sys
 from dotenv import load_dotenv
 
 # 環境変数を読み込む
@@ -12,14 +13,28 @@ if __name__ == "__main__":
     # ホストとポートの設定
     host = os.getenv("HOST", "localhost")
     port = int(os.getenv("PORT", "8000"))
+    workers = int(os.getenv("WORKERS", "1"))
     
     print(f"Starting server in {'debug' if debug else 'production'} mode")
     print(f"Listening on {host}:{port}")
     
     # サーバー起動
-    uvicorn.run(
-        "app.main:app", 
-        host=host, 
-        port=port, 
-        reload=debug
-    )
\ No newline at end of file
+    if debug or workers > 1:
+        # リロードやマルチワーカーではインポート文字列が必要
+        uvicorn.run(
+            "app.main:app", 
+            host=host, 
+            port=port, 
+            reload=debug,
+            workers=None if debug else workers
+        )
+    else:
+        # 本番ではアプリを直接渡し、uvloop（Windows以外）と httptools を明示する
+        from app.main import app
+        uvicorn.run(
+            app, 
+            host=host, 
+            port=port, 
+            loop="auto" if sys.platform == "win32" else "uvloop",
+            http="httptools"
+        )
\ No newline at end of file
@@ -27,13 +27,16 @@ def main():
     
     # Check if GOOGLE_CLOUD_API_KEY is set
     try:
-        with open(".env", "r") as f:
-            env_content = f.read()
-            if "GOOGLE_CLOUD_API_KEY=your_google_cloud_api_key_here" not in env_content:
-                print("✅ .env file exists and API key appears to be configured.")
-            else:
-                print("⚠️  Please set your GOOGLE_CLOUD_API_KEY in .env file.")
-                print("   Current value appears to be the default placeholder.")
+        from dotenv import dotenv_values
+        api_key = dotenv_values(".env").get("GOOGLE_CLOUD_API_KEY")
+        if api_key and api_key != "your_google_cloud_api_key_here":
+            print("✅ .env file exists and API key appears to be configured.")
+        elif api_key:
+            print("⚠️  Please set your GOOGLE_CLOUD_API_KEY in .env file.")
+            print("   Current value appears to be the default placeholder.")
+        else:
+            print("⚠️  Please set your GOOGLE_CLOUD_API_KEY in .env file.")
+            print("   It is missing or empty.")
     except Exception as e:
         print(f"❌ Error reading .env file: {e}")
         return 1
@@ -58,14 +61,27 @@ def main():
     print("")
     
     # Run the server using uv
+    server_cmd = [
+        "uv", "run", "uvicorn", 
+        "app.main:app", 
+        "--reload", 
+        "--host", "0.0.0.0", 
+        "--port", "8000"
+    ]
+    
+    # On POSIX, replace this process with uv so no idle Python wrapper
+    # stays around and Ctrl+C goes straight to the server
+    if os.name == "posix":
+        sys.stdout.flush()
+        sys.stderr.flush()
+        try:
+            os.execvp(server_cmd[0], server_cmd)
+        except FileNotFoundError:
+            print("❌ uv command not found. Please install uv first.")
+            return 1
+    
     try:
-        subprocess.run([
-            "uv", "run", "uvicorn", 
-            "app.main:app", 
-            "--reload", 
-            "--host", "0.0.0.0", 
-            "--port", "8000"
-        ], check=True)
+        subprocess.run(server_cmd, check=True)
     except subprocess.CalledProcessError as e:
         print(f"❌ Failed to start server: {e}")
         return 1
@@ -4,10 +4,20 @@
 """
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
 
+@lru_cache(maxsize=1)
+def _get_model(project, location, model_name):
+    """Vertex AI の初期化とモデル生成は一度だけ行う"""
+    import vertexai
+    from vertexai.generative_models import GenerativeModel
+    
+    vertexai.init(project=project, location=location)
+    return GenerativeModel(model_name)
+
 def test_simple():
     """シンプルなテスト"""
     print("=== シンプル Google API テスト ===")
@@ -26,12 +36,8 @@ def test_simple():
             print("❌ 認証ファイルなし")
         
         # Vertex AI テスト
-        import vertexai
-        from vertexai.generative_models import GenerativeModel
-        
-        vertexai.init(project=project, location='us-central1')
-        model = GenerativeModel('gemini-2.0-flash-001')
-        # model = GenerativeModel('gemini-2.0-flash-lite-001')
+        model = _get_model(project, 'us-central1', 'gemini-2.0-flash-001')
+        # model = _get_model(project, 'us-central1', 'gemini-2.0-flash-lite-001')
         
         response = model.generate_content("Say hello")
         print(f"✅ 成功: {response.text}")
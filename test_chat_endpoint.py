@@ -28,10 +28,13 @@ print("Sending request to:", url)
 print("Request data:", json.dumps(request_data, indent=2))
 print("\n" + "="*50 + "\n")
 
+# Reuse one connection for the preflight and the actual request
+session = requests.Session()
+
 try:
     # First, test OPTIONS request (CORS preflight)
     print("Testing OPTIONS request (CORS preflight)...")
-    options_response = requests.options(url, headers=headers)
+    options_response = session.options(url, headers=headers)
     print(f"OPTIONS Status: {options_response.status_code}")
     print(f"OPTIONS Headers: {dict(options_response.headers)}")
     
@@ -39,7 +42,7 @@ try:
     
     # Then test actual POST request
     print("Testing POST request...")
-    response = requests.post(url, json=request_data, headers=headers)
+    response = session.post(url, json=request_data, headers=headers)
     
     print(f"Status Code: {response.status_code}")
     print(f"Response Headers: {dict(response.headers)}")
@@ -50,4 +53,6 @@ try:
         print(f"Error Response: {response.text}")
         
 except requests.exceptions.RequestException as e:
-    print(f"Request failed: {e}")
\ No newline at end of file
+    print(f"Request failed: {e}")
+finally:
+    session.close()
\ No newline at end of file
@@ -171,5 +171,8 @@ async def main():
         return False
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    run(main())
\ No newline at end of file
@@ -5,146 +5,214 @@ Vertex AI と Google Generative AI の両方をテストします
 """
 
 import os
+import sys
 import asyncio
+import importlib.util
+from functools import lru_cache
+from itertools import islice
+from types import SimpleNamespace
 from dotenv import load_dotenv
 
 # 環境変数を読み込み
 load_dotenv()
 
+def _has_module(name):
+    """モジュールをインポートせずに存在だけ確認する"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        return False
+
+# SDKはモジュール読み込み時に一度だけインポートする（未インストールなら何もしない）
+_HAS_VERTEX = _has_module('vertexai')
+_HAS_GENAI = _has_module('google.generativeai')
+
+if _HAS_VERTEX:
+    import vertexai
+    from vertexai.generative_models import GenerativeModel
+
+if _HAS_GENAI:
+    import google.generativeai as genai
+
+@lru_cache(maxsize=1)
+def _env():
+    """テストで使う環境変数と認証ファイルの存在を一度だけ読み込む"""
+    creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+    return SimpleNamespace(
+        project_id=os.getenv('GOOGLE_CLOUD_PROJECT'),
+        location=os.getenv('VERTEX_AI_LOCATION', 'us-central1'),
+        creds_path=creds_path,
+        creds_exists=bool(creds_path and os.path.exists(creds_path)),
+        api_key=os.getenv('GOOGLE_CLOUD_API_KEY')
+    )
+
+@lru_cache(maxsize=None)
+def _vertex_model(project_id, location, model_name):
+    """Vertex AI の初期化とモデル生成はプロジェクト・モデルごとに一度だけ行う"""
+    vertexai.init(project=project_id, location=location)
+    return GenerativeModel(model_name)
+
+@lru_cache(maxsize=None)
+def _genai_model(model_name):
+    """Google Generative AI のモデルはモデルごとに一度だけ生成する（genai.configure 済みであること）"""
+    return genai.GenerativeModel(model_name)
+
 def test_environment_variables():
     """環境変数の設定を確認"""
     print("=== 環境変数の確認 ===")
     
-    project_id = os.getenv('GOOGLE_CLOUD_PROJECT')
-    creds_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-    location = os.getenv('VERTEX_AI_LOCATION', 'us-central1')
+    env = _env()
     
-    print(f"GOOGLE_CLOUD_PROJECT: {project_id}")
-    print(f"GOOGLE_APPLICATION_CREDENTIALS: {creds_path}")
-    print(f"VERTEX_AI_LOCATION: {location}")
+    print(f"GOOGLE_CLOUD_PROJECT: {env.project_id}")
+    print(f"GOOGLE_APPLICATION_CREDENTIALS: {env.creds_path}")
+    print(f"VERTEX_AI_LOCATION: {env.location}")
     
     # 認証ファイルの存在確認
-    if creds_path and os.path.exists(creds_path):
-        print(f"✅ 認証ファイルが存在します: {creds_path}")
+    if env.creds_exists:
+        print(f"✅ 認証ファイルが存在します: {env.creds_path}")
         return True
     else:
-        print(f"❌ 認証ファイルが見つかりません: {creds_path}")
+        print(f"❌ 認証ファイルが見つかりません: {env.creds_path}")
         return False
 
-def test_vertex_ai():
+def test_vertex_ai(log=print):
     """Vertex AI接続テスト"""
-    print("\n=== Vertex AI 接続テスト ===")
+    log("\n=== Vertex AI 接続テスト ===")
+    
+    if not _HAS_VERTEX:
+        log("❌ vertexai パッケージがインストールされていません")
+        return False
     
     try:
-        import vertexai
-        from vertexai.generative_models import GenerativeModel
-        
-        project_id = os.getenv('GOOGLE_CLOUD_PROJECT')
-        location = os.getenv('VERTEX_AI_LOCATION', 'us-central1')
+        env = _env()
+        project_id = env.project_id
+        location = env.location
         
         if not project_id:
-            print("❌ GOOGLE_CLOUD_PROJECT が設定されていません")
+            log("❌ GOOGLE_CLOUD_PROJECT が設定されていません")
             return False
         
         # Vertex AI初期化
-        print(f"Vertex AI初期化中... (Project: {project_id}, Location: {location})")
-        vertexai.init(project=project_id, location=location)
-        
+        log(f"Vertex AI初期化中... (Project: {project_id}, Location: {location})")
         # モデル作成テスト
-        model = GenerativeModel('gemini-2.0-flash-001')
-        print("✅ Vertex AI接続成功")
+        model = _vertex_model(project_id, location, 'gemini-2.0-flash-001')
+        log("✅ Vertex AI接続成功")
         
         # 簡単なテストメッセージ
-        print("テストメッセージ送信中...")
+        log("テストメッセージ送信中...")
         response = model.generate_content("Hello, this is a test message. Please respond briefly.")
-        print(f"✅ Gemini応答: {response.text[:100]}...")
+        log(f"✅ Gemini応答: {response.text[:100]}...")
         
         return True
         
     except Exception as e:
-        print(f"❌ Vertex AI接続エラー: {str(e)}")
+        log(f"❌ Vertex AI接続エラー: {str(e)}")
         return False
 
-def test_google_generativeai():
+def test_google_generativeai(log=print):
     """Google Generative AI直接接続テスト"""
-    print("\n=== Google Generative AI 直接接続テスト ===")
+    log("\n=== Google Generative AI 直接接続テスト ===")
+    
+    if not _HAS_GENAI:
+        log("❌ google-generativeai パッケージがインストールされていません")
+        return False
     
     try:
-        import google.generativeai as genai
-        
         # API Keyを確認
-        api_key = os.getenv('GOOGLE_CLOUD_API_KEY')
+        api_key = _env().api_key
         if not api_key or api_key == 'your_google_cloud_api_key_here':
-            print("❌ GOOGLE_CLOUD_API_KEY が設定されていません")
+            log("❌ GOOGLE_CLOUD_API_KEY が設定されていません")
             return False
         
         # API Key設定
         genai.configure(api_key=api_key)
         
         # モデル一覧取得テスト
-        print("利用可能なモデル一覧取得中...")
-        models = list(genai.list_models())
+        log("利用可能なモデル一覧取得中...")
+        # 最初の3つだけ取得（残りのページは取得しない）
+        models = list(islice(genai.list_models(), 3))
         if models:
-            print(f"✅ 利用可能なモデル数: {len(models)}")
-            for model in models[:3]:  # 最初の3つを表示
-                print(f"  - {model.name}")
+            log(f"✅ 利用可能なモデル（先頭{len(models)}件）:")
+            for model in models:
+                log(f"  - {model.name}")
         
         # テストメッセージ送信
-        print("テストメッセージ送信中...")
-        model = genai.GenerativeModel('gemini-2.0-flash-001')
+        log("テストメッセージ送信中...")
+        model = _genai_model('gemini-2.0-flash-001')
         response = model.generate_content("Hello, this is a test. Please respond briefly.")
-        print(f"✅ Gemini応答: {response.text[:100]}...")
+        log(f"✅ Gemini応答: {response.text[:100]}...")
         
         return True
         
     except Exception as e:
-        print(f"❌ Google Generative AI接続エラー: {str(e)}")
+        log(f"❌ Google Generative AI接続エラー: {str(e)}")
         return False
 
-async def test_gemini_service():
+async def test_gemini_service(log=print):
     """Gemini Serviceクラスのテスト"""
-    print("\n=== Gemini Service クラステスト ===")
+    log("\n=== Gemini Service クラステスト ===")
     
     try:
         from app.services.gemini_service import gemini_service
         
         # 初期化状態確認
-        print(f"Gemini Service初期化状態: {gemini_service.initialized}")
+        log(f"Gemini Service初期化状態: {gemini_service.initialized}")
         
         if not gemini_service.initialized:
-            print("❌ Gemini Serviceが初期化されていません")
+            log("❌ Gemini Serviceが初期化されていません")
             return False
         
         # テストメッセージ送信
-        print("テストメッセージ送信中...")
+        log("テストメッセージ送信中...")
         response = await gemini_service.send_message(
             model_name="gemini-2.0-flash-001",
             history=[],
             message="Hello, this is a test message from the service class."
         )
         
-        print(f"✅ Gemini Service応答: {response[:100]}...")
+        log(f"✅ Gemini Service応答: {response[:100]}...")
         
         # ストリーミングテスト
-        print("ストリーミングテスト中...")
+        log("ストリーミングテスト中...")
         chunks = []
-        async for chunk in gemini_service.stream_chat(
+        stream = gemini_service.stream_chat(
             model_name="gemini-2.0-flash-001",
             history=[],
             message="Count from 1 to 5."
-        ):
-            chunks.append(chunk)
-            if len(chunks) > 10:  # 最初の10チャンクのみ
-                break
+        )
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                if len(chunks) >= 10:  # 最初の10チャンクのみ
+                    break
+        finally:
+            # 途中で抜けてもストリームをすぐに閉じる
+            await stream.aclose()
         
-        print(f"✅ ストリーミング成功: {len(chunks)} チャンク受信")
+        log(f"✅ ストリーミング成功: {len(chunks)} チャンク受信")
         
         return True
         
     except Exception as e:
-        print(f"❌ Gemini Service エラー: {str(e)}")
+        log(f"❌ Gemini Service エラー: {str(e)}")
         return False
 
+def _buffered(probe):
+    """プローブの出力をまとめて一度に書き出す（並行実行時に行が混ざらないように）"""
+    lines = []
+    try:
+        return probe(lines.append)
+    finally:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+async def _buffered_async(probe):
+    """非同期プローブ版の _buffered"""
+    lines = []
+    try:
+        return await probe(lines.append)
+    finally:
+        sys.stdout.write("\n".join(lines) + "\n")
+
 async def main():
     """メインテスト関数"""
     print("🚀 Google API 接続テスト開始\n")
@@ -152,14 +220,15 @@ async def main():
     # 1. 環境変数チェック
     env_ok = test_environment_variables()
     
-    # 2. Vertex AI テスト
-    vertex_ok = test_vertex_ai()
-    
-    # 3. Google Generative AI 直接テスト
-    genai_ok = test_google_generativeai()
-    
-    # 4. Gemini Service テスト
-    service_ok = await test_gemini_service()
+    # 2-4. Vertex AI / Google Generative AI / Gemini Service テストを並行実行
+    # （同期SDKを使うテストはスレッドに逃がしてイベントループを塞がない）
+    results = await asyncio.gather(
+        asyncio.to_thread(_buffered, test_vertex_ai),
+        asyncio.to_thread(_buffered, test_google_generativeai),
+        _buffered_async(test_gemini_service),
+        return_exceptions=True
+    )
+    vertex_ok, genai_ok, service_ok = (result is True for result in results)
     
     # 結果サマリー
     print("\n" + "="*50)
@@ -184,4 +253,8 @@ async def main():
         print("4. Google Cloud SDKでログイン: gcloud auth application-default login")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    run(main())
\ No newline at end of file
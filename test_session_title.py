@@ -4,13 +4,24 @@ Test script for session title functionality.
 Tests that session titles are updated based on the first user message.
 """
 
-import asyncio
+import itertools
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app.services.session_service import session_service
 from app.models.schemas import ChatSessionCreate, ChatMessage
 
+# Message used by the title truncation test
+LONG_MESSAGE_CONTENT = "これは非常に長いメッセージです。" * 10 + "追加のテキストで文字数を増やしています。"
+LONG_MESSAGE_LENGTH = len(LONG_MESSAGE_CONTENT)
+
+# Read the clock once; each message gets a distinct, increasing timestamp
+_T0 = datetime.now()
+_timestamp_offsets = itertools.count()
+
+def _next_timestamp() -> datetime:
+    return _T0 + timedelta(microseconds=next(_timestamp_offsets))
+
 async def test_session_title_update():
     """Test that session titles are updated when the first user message is added"""
     print("🧪 Testing Session Title Update Functionality...")
@@ -33,10 +44,10 @@ async def test_session_title_update():
         # 2. Add first user message
         print("\n2. Adding first user message...")
         first_message = ChatMessage(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             content="こんにちは！今日の天気はどうですか？天気予報を教えてください。",
             is_user=True,
-            timestamp=datetime.now()
+            timestamp=_next_timestamp()
         )
         
         updated_session = await session_service.add_message_to_session(
@@ -62,10 +73,10 @@ async def test_session_title_update():
         # 3. Add second user message (should not change title)
         print("\n3. Adding second user message...")
         second_message = ChatMessage(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             content="ありがとうございます！とても詳しい説明ですね。",
             is_user=True,
-            timestamp=datetime.now()
+            timestamp=_next_timestamp()
         )
         
         title_before_second = updated_session.title
@@ -98,12 +109,11 @@ async def test_session_title_update():
         long_session = await session_service.create_session(test_user_id, long_session_data)
         
         # Very long message
-        long_message_content = "これは非常に長いメッセージです。" * 10 + "追加のテキストで文字数を増やしています。"
         long_message = ChatMessage(
-            id=str(uuid.uuid4()),
-            content=long_message_content,
+            id=uuid.uuid4().hex,
+            content=LONG_MESSAGE_CONTENT,
             is_user=True,
-            timestamp=datetime.now()
+            timestamp=_next_timestamp()
         )
         
         updated_long_session = await session_service.add_message_to_session(
@@ -112,7 +122,7 @@ async def test_session_title_update():
         
         if updated_long_session:
             print(f"✅ Long message added successfully")
-            print(f"   Original message length: {len(long_message_content)} characters")
+            print(f"   Original message length: {LONG_MESSAGE_LENGTH} characters")
             print(f"   Generated title: '{updated_long_session.title}'")
             print(f"   Generated title length: {len(updated_long_session.title)} characters")
             
@@ -135,8 +145,10 @@ async def test_session_title_update():
         
     except Exception as e:
         print(f"❌ Error during testing: {e}")
+        import sys
         import traceback
-        traceback.print_exc()
+        # Keep the innermost frames only and write them in one go
+        sys.stderr.write(traceback.format_exc(limit=-10))
         return False
 
 async def test_title_generation_function():
@@ -165,11 +177,17 @@ if __name__ == "__main__":
     print("🚀 Session Title Test Suite")
     print("=" * 70)
     
+    # Use uvloop for both runs when available
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    
     # Run title generation tests
-    asyncio.run(test_title_generation_function())
+    run(test_title_generation_function())
     
     # Run session title update tests
-    success = asyncio.run(test_session_title_update())
+    success = run(test_session_title_update())
     
     if success:
         print("\n🎉 All tests completed successfully!")
@@ -6,6 +6,7 @@ Run this to verify your Vertex AI setup is working correctly.
 
 import os
 import asyncio
+import importlib.util
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -52,16 +53,28 @@ async def test_vertex_ai_setup():
         
         test_message = "Hello! Please respond with 'Vertex AI is working correctly' if you can understand this message."
         
-        for model_id in models_to_test:
-            print(f"🔄 Testing model: {model_id}")
-            
+        # send_message awaits the async client, so the regular requests can overlap
+        # (bounded to stay within API quotas)
+        semaphore = asyncio.Semaphore(4)
+        
+        async def send(model_id):
+            async with semaphore:
+                return await gemini_service.send_message(model_id, [], test_message)
+        
+        print(f"🔄 Testing models: {', '.join(models_to_test)}")
+        responses = await asyncio.gather(
+            *(send(model_id) for model_id in models_to_test),
+            return_exceptions=True
+        )
+        
+        for model_id, response in zip(models_to_test, responses):
             try:
-                # Test regular message
-                response = await gemini_service.send_message(model_id, [], test_message)
+                if isinstance(response, Exception):
+                    raise response
                 print(f"✅ Response from {model_id}:")
                 print(f"   {response[:100]}{'...' if len(response) > 100 else ''}")
                 
-                # Test streaming
+                # stream_chat iterates a synchronous stream, so test streaming one model at a time
                 print(f"🔄 Testing streaming for {model_id}...")
                 stream_response = ""
                 async for chunk in gemini_service.stream_chat(model_id, [], "Count from 1 to 5"):
@@ -151,10 +164,16 @@ def check_dependencies():
     missing_packages = []
     
     for package in required_packages:
+        # find_spec only locates the package; it does not execute it
         try:
-            __import__(package)
+            found = importlib.util.find_spec(package) is not None
+        except ModuleNotFoundError:
+            # Parent package (e.g. "google") is missing
+            found = False
+        
+        if found:
             print(f"✅ {package}")
-        except ImportError:
+        else:
             print(f"❌ {package}")
             missing_packages.append(package)
     
@@ -174,12 +193,18 @@ if __name__ == "__main__":
     if not check_dependencies():
         exit(1)
     
+    # Use uvloop for the async tests when available
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    
     # Run async tests
-    success = asyncio.run(test_vertex_ai_setup())
+    success = run(test_vertex_ai_setup())
     
     if success:
         # Test API endpoints if basic tests pass
-        asyncio.run(test_api_endpoints())
+        run(test_api_endpoints())
         print("\n🎉 Setup verification complete!")
         print("Your Vertex AI integration is ready to use.")
     else: